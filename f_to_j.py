@@ -1,22 +1,92 @@
 import os
 import sys
 import argparse
-import tempfile
 import shutil
+import stat
 import zipfile
 import re
+import mmap
+import threading
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 import opencc
 import xml.etree.ElementTree as ET
 import xml.dom.minidom as minidom
 
-def convert_epub_to_simplified(input_path, output_path=None):
+# 官方的opencc包（pip install opencc）通过opencc.clib调用C++实现的libopencc，
+# opencc-python-reimplemented的模块名同样是opencc，但为纯Python实现
+try:
+    _OPENCC_NATIVE = importlib.util.find_spec('opencc.clib') is not None
+except ModuleNotFoundError:
+    _OPENCC_NATIVE = False
+
+try:
+    # 可选依赖：pip install "pyahocorasick>=2"
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# 可选依赖：pip install zlib-ng 或 pip install isal，提供SIMD加速的DEFLATE和CRC32实现
+try:
+    from zlib_ng import zlib_ng
+except ImportError:
+    zlib_ng = None
+
+try:
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+
+# 二者与标准库zlib接口兼容，替换后解压和打包EPUB都会使用更快的实现
+fast_zlib = zlib_ng or isal_zlib
+if fast_zlib is not None:
+    zipfile.zlib = fast_zlib
+    # zipfile读写每个条目都要计算CRC32，isal使用PCLMULQDQ/VPCLMULQDQ指令计算，优先使用
+    zipfile.crc32 = (isal_zlib or zlib_ng).crc32
+
+try:
+    # 可选依赖：pip install charset-normalizer
+    import charset_normalizer
+except ImportError:
+    charset_normalizer = None
+
+# 标签之间的文本节点；HTML中跳过script/style中的代码（含自闭合的<script .../>）
+_XML_TEXT_RE = re.compile(r'(?<=>)(?P<text>[^<>]+)(?=<)')
+_HTML_TEXT_RE = re.compile(r'<(script|style)\b[^>]*?(?:/>|>.*?</\1\s*>)|(?<=>)(?P<text>[^<>]+)(?=<)', re.I | re.S)
+# 汉字（含扩展A/B及兼容汉字），不含汉字的文本无需转换
+_CJK_RE = re.compile('[\u3400-\u9fff\uf900-\ufaff\U00020000-\U0002ffff]')
+
+# 以上三个模式的字节版本，用于直接处理UTF-8内容；标签分隔符均为ASCII，不会落在多字节字符中间
+_XML_TEXT_BYTES_RE = re.compile(rb'(?<=>)(?P<text>[^<>]+)(?=<)')
+_HTML_TEXT_BYTES_RE = re.compile(rb'<(script|style)\b[^>]*?(?:/>|>.*?</\1\s*>)|(?<=>)(?P<text>[^<>]+)(?=<)', re.I | re.S)
+# 同一汉字范围在UTF-8中的首字节（内容已验证为合法UTF-8，因此匹配即代表该字符）
+_CJK_BYTES_RE = re.compile(rb'\xe3[\x90-\xbf]|[\xe4-\xe9]|\xef[\xa4-\xab]|\xf0[\xa0-\xaf]')
+# 表示简体中文的语言标签（已统一为小写和连字符）
+_SIMPLIFIED_LANGUAGE_RE = re.compile(r'zh-(hans|cn|sg)\b')
+
+# 需要转换的文件类型
+_HTML_EXTENSIONS = frozenset({'.xhtml', '.html', '.htm'})
+_TEXT_EXTENSIONS = _HTML_EXTENSIONS | {'.xml', '.opf', '.ncx'}
+
+# 本身已经压缩过的媒体文件类型
+_INCOMPRESSIBLE_EXTENSIONS = frozenset({
+    '.jpg', '.jpeg', '.png', '.gif', '.webp',
+    '.woff', '.woff2',
+    '.mp3', '.m4a', '.ogg', '.mp4', '.webm',
+})
+
+# 批量转换时拼接文本节点所用的分隔符
+_BATCH_SEPARATOR = '\x1e\x1f'
+
+def convert_epub_to_simplified(input_path, output_path=None, force=False):
     """
     将EPUB文件从繁体转为简体
     
     Args:
         input_path: 输入EPUB文件路径
         output_path: 输出EPUB文件路径，如果为None则自动生成
+        force: 为True时即使OPF声明为简体中文也进行转换
     
     Returns:
         bool: 转换是否成功
@@ -34,278 +104,574 @@ def convert_epub_to_simplified(input_path, output_path=None):
     
     # 初始化OpenCC转换器
     try:
-        converter = opencc.OpenCC('t2s')
+        get_converter()
     except Exception as e:
-        try:
-            # 尝试使用完整路径
-            opencc_path = os.path.dirname(opencc.__file__)
-            config_path = os.path.join(opencc_path, 'config', 't2s.json')
-            if os.path.exists(config_path):
-                converter = opencc.OpenCC(config_path)
-            else:
-                # 尝试使用内置转换器
-                converter = opencc.OpenCC('t2s.json')
-        except Exception as e:
-            print(f"❌ 初始化繁简转换器失败: {e}")
-            return False
+        print(f"❌ 初始化繁简转换器失败: {e}")
+        return False
     
-    try:
-        # 创建临时目录用于处理文件
-        with tempfile.TemporaryDirectory() as temp_dir:
-            extract_dir = os.path.join(temp_dir, "extract")
-            os.makedirs(extract_dir, exist_ok=True)
-            
-            # 复制源文件到临时文件，确保源文件不被修改
-            temp_file = os.path.join(temp_dir, "temp.epub")
-            shutil.copy2(input_path, temp_file)
-            
-            # 解压EPUB文件
+    # OPF已声明为简体中文时无需转换，直接复制原文件
+    if not force:
+        language = get_epub_language(input_path)
+        if language and _SIMPLIFIED_LANGUAGE_RE.match(language.strip().lower().replace('_', '-')):
+            print(f"ℹ️ 书籍语言已声明为 {language}（简体中文），无需转换；如需强制转换请使用 --force")
             try:
-                with zipfile.ZipFile(temp_file, 'r') as zip_ref:
-                    zip_ref.extractall(extract_dir)
-                print("✅ 成功解压EPUB文件")
-            except Exception as e:
-                print(f"❌ 解压EPUB文件失败: {e}")
-                return False
-            
-            # 处理所有文本文件
-            html_count = 0
-            changed_count = 0
-            
-            # 处理HTML/XHTML文件
-            for root, dirs, files in os.walk(extract_dir):
-                for file in files:
-                    if file.endswith(('.xhtml', '.html', '.htm', '.xml', '.opf', '.ncx')):
-                        file_path = os.path.join(root, file)
-                        
-                        try:
-                            # 读取文件内容
-                            with open(file_path, 'rb') as f:
-                                content_bytes = f.read()
-                            
-                            # 尝试解码
-                            try:
-                                content = content_bytes.decode('utf-8', errors='ignore')
-                            except Exception:
-                                try:
-                                    content = content_bytes.decode('gb18030', errors='ignore')
-                                except Exception:
-                                    content = content_bytes.decode('latin1', errors='ignore')
-                            
-                            # 保存原始XML声明和DOCTYPE
-                            xml_declaration = None
-                            match = re.search(r'<\?xml[^>]+\?>', content)
-                            if match:
-                                xml_declaration = match.group(0)
-                            
-                            doctype = None
-                            match = re.search(r'<!DOCTYPE[^>]+>', content)
-                            if match:
-                                doctype = match.group(0)
-                            
-                            # 根据文件类型选择处理方法
-                            if file.endswith(('.xhtml', '.html', '.htm')):
-                                html_count += 1
-                                changed, new_content = convert_html_content(content, converter)
-                                
-                                if changed:
-                                    # 恢复XML声明和DOCTYPE
-                                    if xml_declaration and not new_content.startswith('<?xml'):
-                                        new_content = xml_declaration + '\n' + new_content
-                                    if doctype and '<!DOCTYPE' not in new_content:
-                                        if xml_declaration and new_content.startswith('<?xml'):
-                                            # 在XML声明后插入DOCTYPE
-                                            new_content = new_content.replace('?>\n', '?>\n' + doctype + '\n')
-                                        else:
-                                            new_content = doctype + '\n' + new_content
-                                    
-                                    # 写回文件
-                                    with open(file_path, 'w', encoding='utf-8', newline='') as f:
-                                        f.write(new_content)
-                                    
-                                    changed_count += 1
-                                    print(f"✅ 已转换HTML文件: {os.path.basename(file_path)}")
-                            
-                            elif file.endswith(('.xml', '.opf', '.ncx')):
-                                changed, new_content = convert_xml_content(content, converter)
-                                
-                                if changed:
-                                    # 恢复XML声明
-                                    if xml_declaration and not new_content.startswith('<?xml'):
-                                        new_content = xml_declaration + '\n' + new_content
-                                    
-                                    # 写回文件
-                                    with open(file_path, 'w', encoding='utf-8', newline='') as f:
-                                        f.write(new_content)
-                                    
-                                    print(f"✅ 已转换XML文件: {os.path.basename(file_path)}")
-                        
-                        except Exception as e:
-                            print(f"⚠️ 处理文件 {os.path.basename(file_path)} 时出错: {e}")
-            
-            print(f"📊 共处理 {html_count} 个HTML文件，其中 {changed_count} 个文件有变化")
-            
-            # 确保mimetype文件正确
-            mimetype_path = os.path.join(extract_dir, 'mimetype')
-            with open(mimetype_path, 'w', encoding='utf-8', newline='') as f:
-                f.write('application/epub+zip')
-            
-            # 手动打包EPUB文件，确保WPS兼容性
-            if package_epub_safely(extract_dir, output_path):
-                print(f"✅ 新的简体EPUB文件已生成: {output_path}")
+                if os.path.abspath(output_path) != os.path.abspath(input_path):
+                    shutil.copyfile(input_path, output_path)
+                print(f"✅ 已复制原文件: {output_path}")
                 return True
-            else:
-                print("❌ 打包EPUB文件失败")
+            except Exception as e:
+                print(f"❌ 复制文件失败: {e}")
                 return False
-                
+    
+    try:
+        # 在内存中读取所有条目，读取完成后才写输出文件，因此输出路径与输入相同时也不会损坏源文件
+        try:
+            with zipfile.ZipFile(input_path, 'r') as src:
+                # mimetype由打包时统一写入，目录条目无需保留
+                infos = [info for info in src.infolist()
+                         if not info.is_dir() and info.filename != 'mimetype']
+            members = read_members(input_path, infos)
+            print("✅ 成功读取EPUB文件")
+        except Exception as e:
+            print(f"❌ 读取EPUB文件失败: {e}")
+            return False
+        
+        # 处理所有文本文件
+        html_count = 0
+        changed_count = 0
+        
+        # 收集需要处理的HTML/XHTML/XML文件
+        text_indexes = [i for i, info in enumerate(infos)
+                        if _extension(info.filename) in _TEXT_EXTENSIONS]
+        
+        # 多进程并行转换，每个工作进程各自初始化转换器
+        max_workers = max(2, min(os.cpu_count() or 1, 8))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+            results = list(executor.map(_convert_one,
+                                        [infos[i].filename for i in text_indexes],
+                                        [members[i] for i in text_indexes],
+                                        chunksize=4))
+        
+        for i, (name, is_html, new_data, error) in zip(text_indexes, results):
+            # 出错的HTML文件同样计入处理总数
+            if is_html:
+                html_count += 1
+            if error:
+                print(f"⚠️ 处理文件 {os.path.basename(name)} 时出错: {error}")
+                continue
+            if new_data is not None:
+                members[i] = new_data
+            if is_html:
+                if new_data is not None:
+                    changed_count += 1
+                    print(f"✅ 已转换HTML文件: {os.path.basename(name)}")
+            elif new_data is not None:
+                print(f"✅ 已转换XML文件: {os.path.basename(name)}")
+        
+        print(f"📊 共处理 {html_count} 个HTML文件，其中 {changed_count} 个文件有变化")
+        
+        # 直接写入新的EPUB文件，确保WPS兼容性
+        if write_epub(zip(infos, members), output_path):
+            print(f"✅ 新的简体EPUB文件已生成: {output_path}")
+            return True
+        else:
+            print("❌ 打包EPUB文件失败")
+            return False
+    
     except Exception as e:
         print(f"❌ 处理过程中出错: {e}")
         return False
 
+def get_epub_language(epub_path):
+    """
+    读取EPUB中OPF文件声明的语言（第一个dc:language）
+    
+    Args:
+        epub_path: EPUB文件路径
+    
+    Returns:
+        str: 语言标签，例如'zh-TW'；无法读取时返回None
+    """
+    try:
+        with zipfile.ZipFile(epub_path, 'r') as zipf:
+            # 通过container.xml找到OPF文件
+            container = ET.fromstring(zipf.read('META-INF/container.xml'))
+            rootfile = container.find('.//{urn:oasis:names:tc:opendocument:xmlns:container}rootfile')
+            if rootfile is None or not rootfile.get('full-path'):
+                return None
+            
+            opf = ET.fromstring(zipf.read(rootfile.get('full-path')))
+            language = opf.find('.//{http://purl.org/dc/elements/1.1/}language')
+            if language is None or not language.text:
+                return None
+            return language.text.strip()
+    except Exception:
+        return None
+
+def _init_converter():
+    """
+    初始化OpenCC繁简转换器
+    
+    Returns:
+        OpenCC: 繁体转简体转换器
+    """
+    try:
+        return opencc.OpenCC('t2s')
+    except Exception:
+        # 尝试使用完整路径
+        opencc_path = os.path.dirname(opencc.__file__)
+        config_path = os.path.join(opencc_path, 'config', 't2s.json')
+        if os.path.exists(config_path):
+            return opencc.OpenCC(config_path)
+        # 尝试使用内置转换器
+        return opencc.OpenCC('t2s.json')
+
+def _build_automaton():
+    """
+    由OpenCC的繁转简词典构建Aho-Corasick自动机
+    
+    Returns:
+        Automaton: 自动机，未安装pyahocorasick、找不到文本词典或使用C++版OpenCC时返回None
+    """
+    # C++版OpenCC一次调用即可在C中完成整段转换，比逐个匹配回调Python更快
+    if ahocorasick is None or _OPENCC_NATIVE:
+        return None
+    
+    dictionary_dir = os.path.join(os.path.dirname(opencc.__file__), 'dictionary')
+    automaton = ahocorasick.Automaton()
+    # 最长匹配所需的iter_long从pyahocorasick 2.0开始提供
+    if not hasattr(automaton, 'iter_long'):
+        return None
+    # 后加入的词组会覆盖同名的单字条目
+    for name in ('TSCharacters.txt', 'TSPhrases.txt'):
+        dictionary_path = os.path.join(dictionary_dir, name)
+        if not os.path.exists(dictionary_path):
+            return None
+        with open(dictionary_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                traditional, _, simplified = line.rstrip('\n').partition('\t')
+                if traditional and simplified:
+                    # 一对多时取第一个候选，与OpenCC一致
+                    automaton.add_word(traditional, (len(traditional), simplified.split(' ')[0]))
+    
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+# 模块级转换器，首次使用时初始化，连续转换多本书时只加载一次词典
+_converter = None
+# 工作进程中的自动机，由_init_worker设置
+_automaton = None
+# 工作进程中的转换结果缓存，章节标题、页眉页脚、导航标签等在整本书中大量重复
+_convert_cache = {}
+_CONVERT_CACHE_SIZE = 1 << 16
+
+def get_converter():
+    """
+    获取模块级的OpenCC繁简转换器，首次调用时初始化
+    
+    Returns:
+        OpenCC: 繁体转简体转换器
+    """
+    global _converter
+    if _converter is None:
+        _converter = _init_converter()
+    return _converter
+
+def _init_worker():
+    """
+    工作进程初始化函数，每个进程只构造一次转换器和自动机
+    """
+    global _automaton
+    # 以fork方式启动时直接继承父进程已初始化的转换器
+    get_converter()
+    if _automaton is None:
+        _automaton = _build_automaton()
+    # 以fork方式启动时会继承父进程的缓存，每本书从空缓存开始以控制内存
+    _convert_cache.clear()
+
+def _convert_text(text, converter):
+    """
+    转换一段文本，工作进程中优先使用自动机做一次线性的最长匹配扫描
+    
+    Args:
+        text: 待转换文本
+        converter: OpenCC转换器
+    
+    Returns:
+        str: 转换后的文本
+    """
+    if _automaton is None or converter is not _converter:
+        return converter.convert(text)
+    
+    parts = []
+    pos = 0
+    for end, (length, simplified) in _automaton.iter_long(text):
+        start = end - length + 1
+        parts.append(text[pos:start])
+        parts.append(simplified)
+        pos = end + 1
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+def detect_encoding(raw):
+    """
+    检测文件编码，EPUB规定使用UTF-8/UTF-16，先走BOM和UTF-8快速路径
+    
+    Args:
+        raw: 文件内容（字节）
+    
+    Returns:
+        str: 能够解码该内容的编码名称，无法可靠判断时返回None
+    """
+    if raw.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig'
+    if raw.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'utf-16'
+    
+    try:
+        raw.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    # 非UTF-8内容才进行完整检测；只凭猜测的编码改写文件会损坏内容，因此不再回退到固定编码
+    if charset_normalizer is not None:
+        best = charset_normalizer.from_bytes(raw).best()
+        if best is not None:
+            return best.encoding
+    
+    return None
+
+def _convert_one(name, content_bytes):
+    """
+    转换单个HTML/XHTML/XML文件（在工作进程中执行）
+    
+    Args:
+        name: 文件在EPUB中的路径
+        content_bytes: 文件内容（字节）
+    
+    Returns:
+        (str, bool, bytes, str): 文件路径，是否为HTML文件，转换后的内容（无变化时为None），错误信息
+    """
+    is_html = _extension(name) in _HTML_EXTENSIONS
+    try:
+        # 记下实际使用的编码以便按原编码写回；UTF-8内容直接按字节匹配和替换，
+        # 只解码需要转换的文本节点，省去整个文件的解码和编码
+        encoding = detect_encoding(content_bytes)
+        if encoding is None:
+            # 编码无法确定时保留原文件，不按猜测的编码转换
+            return name, is_html, None, "无法确定文件编码，已保留原文件"
+        if encoding in ('utf-8', 'utf-8-sig'):
+            content = content_bytes
+        else:
+            content = content_bytes.decode(encoding)
+        
+        # 只改写标签之间的文本，XML声明和DOCTYPE无需另行恢复
+        converter = get_converter()
+        if is_html:
+            changed, new_content = convert_html_content(content, converter)
+        else:
+            changed, new_content = convert_xml_content(content, converter)
+        
+        if not changed:
+            return name, is_html, None, None
+        if isinstance(new_content, str):
+            # Big5等繁体编码没有大部分简体字的码位，无法编码的字符写成XHTML/XML均支持的字符引用
+            new_content = new_content.encode(encoding, errors='xmlcharrefreplace')
+        return name, is_html, new_content, None
+    
+    except Exception as e:
+        return name, is_html, None, str(e)
+
+def _convert_batch(texts, converter):
+    """
+    批量转换多个互不相同的文本，已转换过的直接取缓存，其余拼接后一次性转换
+    
+    Args:
+        texts: 待转换的文本列表（str，或UTF-8编码的bytes），不含重复项
+        converter: OpenCC转换器
+    
+    Returns:
+        list: 与texts顺序一致、类型相同的转换结果
+    """
+    if isinstance(texts[0], bytes):
+        texts = [text.decode('utf-8') for text in texts]
+        return [text.encode('utf-8') for text in _convert_batch(texts, converter)]
+    
+    # 只缓存模块级转换器的结果，调用方传入的其他转换器每次重新转换
+    cache = _convert_cache if converter is _converter else {}
+    results = {}
+    missing = []
+    for text in texts:
+        new_text = cache.get(text)
+        if new_text is None:
+            missing.append(text)
+        else:
+            results[text] = new_text
+    
+    if missing:
+        converted = _convert_joined(missing, converter)
+        # 超出上限时整体清空，控制单本书的内存占用
+        if len(cache) + len(missing) > _CONVERT_CACHE_SIZE:
+            cache.clear()
+        cache.update(zip(missing, converted))
+        results.update(zip(missing, converted))
+    
+    return [results[text] for text in texts]
+
+def _convert_joined(texts, converter):
+    """
+    用分隔符拼接多个文本后一次性转换，摊薄逐个调用转换器的开销
+    
+    Args:
+        texts: 待转换文本列表
+        converter: OpenCC转换器
+    
+    Returns:
+        list: 与texts顺序一致的转换结果
+    """
+    if len(texts) == 1:
+        return [_convert_text(texts[0], converter)]
+    
+    # 分隔符为XML中不允许出现的控制字符，不会出现在词典中，也不会与前后文本组成词组
+    parts = _convert_text(_BATCH_SEPARATOR.join(texts), converter).split(_BATCH_SEPARATOR)
+    if len(parts) != len(texts):
+        # 文本本身含有分隔符时逐个转换
+        return [_convert_text(text, converter) for text in texts]
+    return parts
+
+def _convert_text_nodes(content, converter, pattern):
+    """
+    转换标签之间的文本节点，标签、属性以及XML声明/DOCTYPE原样保留
+    
+    Args:
+        content: HTML/XML内容（str，或UTF-8编码的bytes）
+        converter: OpenCC转换器
+        pattern: 与content类型相同的已编译正则表达式，文本位于名为text的分组中
+    
+    Returns:
+        (bool, str): 是否有变化，转换后的内容（与content类型相同）
+    """
+    cjk_pattern = _CJK_BYTES_RE if isinstance(content, bytes) else _CJK_RE
+    
+    # 收集含汉字的文本节点位置（跳过纯数字、空白、英文等）
+    spans = []
+    for match in pattern.finditer(content):
+        text = match.group('text')
+        # script/style等不含text分组的匹配原样保留
+        if text is not None and cjk_pattern.search(text):
+            spans.append((match.start('text'), match.end('text'), text))
+    if not spans:
+        return False, content
+    
+    # 相同文本只转换一次，只记录有变化的文本
+    texts = list(dict.fromkeys(text for _, _, text in spans))
+    converted = {text: new_text
+                 for text, new_text in zip(texts, _convert_batch(texts, converter))
+                 if new_text != text}
+    if not converted:
+        return False, content
+    
+    # 按位置一次性拼接未变化的片段和替换后的文本
+    parts = []
+    pos = 0
+    for start, end, text in spans:
+        new_text = converted.get(text)
+        if new_text is not None:
+            parts.append(content[pos:start])
+            parts.append(new_text)
+            pos = end
+    parts.append(content[pos:])
+    
+    return True, content[:0].join(parts)
+
 def convert_html_content(content, converter):
     """
     转换HTML内容中的文本，保留原始HTML结构
     
     Args:
-        content: HTML内容
+        content: HTML内容（str，或UTF-8编码的bytes）
         converter: OpenCC转换器
     
     Returns:
-        (bool, str): 是否有变化，转换后的内容
+        (bool, str): 是否有变化，转换后的内容（与content类型相同）
     """
-    # 使用正则表达式提取和转换文本，更安全
-    changed = False
-    
-    # 只替换标签之间的文本，不修改标签和属性
-    def replace_text(match):
-        nonlocal changed
-        text = match.group(1)
-        # 跳过纯数字、空白等内容
-        if re.match(r'^[\s\d.,:;!?]+$', text):
-            return match.group(0)
-        new_text = converter.convert(text)
-        if new_text != text:
-            changed = True
-            return f">{new_text}<"
-        return match.group(0)
-    
-    # 只替换标签之间的文本
-    pattern = r'>([^<>]+)<'
-    new_content = re.sub(pattern, replace_text, content)
-    
-    return changed, new_content
+    # 只替换标签之间的文本，跳过script/style中的代码
+    pattern = _HTML_TEXT_BYTES_RE if isinstance(content, bytes) else _HTML_TEXT_RE
+    return _convert_text_nodes(content, converter, pattern)
 
 def convert_xml_content(content, converter):
     """
     安全地转换XML内容中的文本
     
     Args:
-        content: XML内容
+        content: XML内容（str，或UTF-8编码的bytes）
         converter: OpenCC转换器
     
     Returns:
-        (bool, str): 是否有变化，转换后的内容
+        (bool, str): 是否有变化，转换后的内容（与content类型相同）
     """
-    # 使用正则表达式提取和转换文本，更安全
-    changed = False
-    
     # 只替换标签之间的文本，不修改标签和属性
-    def replace_text(match):
-        nonlocal changed
-        text = match.group(1)
-        # 跳过纯数字、空白等内容
-        if re.match(r'^[\s\d.,:;!?]+$', text):
-            return match.group(0)
-        new_text = converter.convert(text)
-        if new_text != text:
-            changed = True
-            return f">{new_text}<"
-        return match.group(0)
+    pattern = _XML_TEXT_BYTES_RE if isinstance(content, bytes) else _XML_TEXT_RE
+    return _convert_text_nodes(content, converter, pattern)
+
+class _MappedFile(mmap.mmap):
+    """
+    只读内存映射文件，补上zipfile需要的seekable()（Python 3.13之前mmap没有该方法）
+    """
+    def seekable(self):
+        return True
+
+def _open_mapped_zip(epub_path):
+    """
+    以内存映射方式打开EPUB文件，读取条目时直接从页缓存复制数据，省去逐块read的系统调用
     
-    # 只替换标签之间的文本
-    pattern = r'>([^<>]+)<'
-    new_content = re.sub(pattern, replace_text, content)
+    Args:
+        epub_path: EPUB文件路径
     
-    return changed, new_content
+    Returns:
+        (ZipFile, _MappedFile): ZipFile句柄及其映射，空文件无法映射时映射为None
+    """
+    with open(epub_path, 'rb') as f:
+        # 空文件无法映射，交给zipfile按路径打开并报告错误
+        if os.fstat(f.fileno()).st_size == 0:
+            return zipfile.ZipFile(epub_path, 'r'), None
+        mapped = _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return zipfile.ZipFile(mapped, 'r'), mapped
+    except Exception:
+        mapped.close()
+        raise
+
+def read_members(epub_path, infos):
+    """
+    多线程并行解压EPUB条目，每个线程使用独立的ZipFile句柄和内存映射
+    
+    Args:
+        epub_path: EPUB文件路径
+        infos: 要读取的ZipInfo列表
+    
+    Returns:
+        list: 与infos顺序一致的条目内容（字节）
+    """
+    # 同一个ZipFile句柄的读取会被内部锁串行化，而zlib解压时会释放GIL
+    local = threading.local()
+    handles = []
+    
+    def read(info):
+        zipf = getattr(local, 'zipf', None)
+        if zipf is None:
+            zipf, mapped = _open_mapped_zip(epub_path)
+            local.zipf = zipf
+            handles.append((zipf, mapped))
+        return zipf.read(info)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            return list(executor.map(read, infos))
+    finally:
+        # ZipFile不会关闭传入的文件对象，映射需要单独关闭
+        for zipf, mapped in handles:
+            zipf.close()
+            if mapped is not None:
+                mapped.close()
+
+def _compress_type(rel_path):
+    """
+    返回EPUB条目应使用的压缩方式，mimetype、META-INF下的文件以及已压缩过的媒体文件不压缩
+    
+    Args:
+        rel_path: 条目在EPUB中的路径（使用正斜杠）
+    
+    Returns:
+        int: zipfile压缩方式
+    """
+    if rel_path == 'mimetype' or rel_path.startswith('META-INF/'):
+        return zipfile.ZIP_STORED
+    # 图片、字体、音视频再次DEFLATE几乎不会变小，只会浪费CPU
+    if _extension(rel_path) in _INCOMPRESSIBLE_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
 
-def package_epub_safely(extract_dir, output_path):
+def write_epub(members, output_path):
     """
-    安全地打包EPUB文件，确保WPS兼容性
+    将内存中的条目直接写成EPUB文件，确保WPS兼容性
     
     Args:
-        extract_dir: 解压目录
+        members: (ZipInfo, bytes)序列，不含mimetype
         output_path: 输出文件路径
     
     Returns:
         bool: 是否成功
     """
     try:
-        # 确保输出目录存在
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
-        
-        # 确保输出文件不存在
-        if os.path.exists(output_path):
-            os.remove(output_path)
+        # META-INF下的文件紧跟mimetype写入，其余条目保持原有顺序
+        members = sorted(members, key=lambda member: not member[0].filename.startswith('META-INF/'))
         
-        # 使用zipfile库手动控制打包过程
         with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zipf:
             # 首先添加mimetype文件，不压缩
-            mimetype_path = os.path.join(extract_dir, 'mimetype')
-            if os.path.exists(mimetype_path):
-                zipf.write(mimetype_path, 'mimetype', compress_type=zipfile.ZIP_STORED)
-            else:
-                # 如果不存在，创建一个
-                zipf.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
+            zipf.writestr('mimetype', 'application/epub+zip', compress_type=zipfile.ZIP_STORED)
             
-            # 添加META-INF目录下的文件，不压缩
-            meta_inf_dir = os.path.join(extract_dir, 'META-INF')
-            if os.path.exists(meta_inf_dir):
-                for root, dirs, files in os.walk(meta_inf_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(file_path, extract_dir)
-                        # 统一路径分隔符为正斜杠（EPUB标准）
-                        rel_path = rel_path.replace(os.sep, '/')
-                        zipf.write(file_path, rel_path, compress_type=zipfile.ZIP_STORED)
-            
-            # 添加其他文件
-            for root, dirs, files in os.walk(extract_dir):
-                for file in files:
-                    if file == 'mimetype' or root.startswith(meta_inf_dir):
-                        continue  # 已经添加过了
-                    
-                    file_path = os.path.join(root, file)
-                    rel_path = os.path.relpath(file_path, extract_dir)
-                    
-                    # 统一路径分隔符为正斜杠（EPUB标准）
-                    rel_path = rel_path.replace(os.sep, '/')
-                    
-                    # 添加文件
-                    zipf.write(file_path, rel_path, compress_type=zipfile.ZIP_DEFLATED)
+            for info, data in members:
+                # 保留原条目的时间、属性以及属性所对应的系统
+                new_info = zipfile.ZipInfo(info.filename, info.date_time)
+                new_info.create_system = info.create_system
+                new_info.external_attr = info.external_attr
+                # Windows上生成的条目只有DOS属性（高16位为0），解压到Unix会得到0000权限，
+                # 与原来按实际文件打包时一样改为普通文件的0644权限
+                if info.external_attr >> 16 == 0:
+                    new_info.create_system = 3
+                    new_info.external_attr = ((stat.S_IFREG | 0o644) << 16) | (info.external_attr & 0xFFFF)
+                new_info.compress_type = _compress_type(info.filename)
+                zipf.writestr(new_info, data)
         
         # 验证生成的文件
-        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-            try:
-                with zipfile.ZipFile(output_path, 'r') as zip_ref:
-                    # 检查是否可以列出文件
-                    file_list = zip_ref.namelist()
-                    if 'mimetype' not in file_list:
-                        print("⚠️ 警告：生成的EPUB文件缺少mimetype文件")
-                        return False
-                return True
-            except Exception as e:
-                print(f"❌ 验证生成的EPUB文件失败: {e}")
-                return False
-        else:
-            print("❌ 生成的EPUB文件不存在或为空")
-            return False
+        return _verify_epub(output_path)
     
     except Exception as e:
         print(f"❌ 打包EPUB文件时出错: {e}")
         return False
 
+def _verify_epub(output_path):
+    """
+    验证生成的EPUB文件可以打开且包含mimetype
+    
+    Args:
+        output_path: 输出文件路径
+    
+    Returns:
+        bool: 是否有效
+    """
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        try:
+            with zipfile.ZipFile(output_path, 'r') as zip_ref:
+                # 检查是否可以列出文件
+                file_list = zip_ref.namelist()
+                if 'mimetype' not in file_list:
+                    print("⚠️ 警告：生成的EPUB文件缺少mimetype文件")
+                    return False
+            return True
+        except Exception as e:
+            print(f"❌ 验证生成的EPUB文件失败: {e}")
+            return False
+    else:
+        print("❌ 生成的EPUB文件不存在或为空")
+        return False
+
+def _extension(path):
+    """
+    返回小写的文件扩展名
+    
+    Args:
+        path: 文件路径或EPUB条目路径
+    
+    Returns:
+        str: 扩展名，例如'.xhtml'
+    """
+    return os.path.splitext(path)[1].lower()
+
 def main():
     """
     主函数
@@ -318,14 +684,15 @@ def main():
         import opencc
     except ImportError as e:
         print(f"❌ 缺少必要的库: {e}")
-        print("请安装所需的库:")
-        print("pip install opencc-python-reimplemented")
+        print("请安装所需的库（推荐C++实现的opencc，速度更快；也可安装纯Python实现的opencc-python-reimplemented）:")
+        print("pip install opencc")
         return
     
     # 使用命令行参数
     parser = argparse.ArgumentParser(description="EPUB繁体转简体转换工具")
     parser.add_argument("epub_file", nargs="?", help="EPUB文件路径")
     parser.add_argument("-o", "--output", help="输出文件路径")
+    parser.add_argument("-f", "--force", action="store_true", help="即使书籍已声明为简体中文也进行转换")
     args = parser.parse_args()
     
     # 从命令行参数获取文件路径
@@ -341,7 +708,7 @@ def main():
         return
     
     # 转换文件
-    success = convert_epub_to_simplified(epub_file, output_file)
+    success = convert_epub_to_simplified(epub_file, output_file, force=args.force)
     
     if success:
         print("✅ 转换完成！")